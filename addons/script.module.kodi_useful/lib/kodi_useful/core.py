@@ -4,7 +4,7 @@ import configparser
 import logging
 import json
 import typing as t
-from urllib.parse import parse_qs, urlencode
+from urllib.parse import unquote_plus, urlencode
 
 
 __all__ = (
@@ -14,26 +14,60 @@ __all__ = (
 
 logger = logging.getLogger()
 
+try:
+    import orjson
+
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+
+_BOOLEAN_STATES = configparser.ConfigParser.BOOLEAN_STATES
+
 
 def cast_bool(v: str) -> bool:
-    with suppress(KeyError):
-        v = configparser.ConfigParser.BOOLEAN_STATES[v]
-    return bool(v)
+    return _BOOLEAN_STATES.get(v, bool(v))
 
 
 def loads(v):
     with suppress(json.JSONDecodeError):
-        v = json.loads(v)
+        v = json_loads(v)
     return v
 
 
 class QueryParams:
     def __init__(self, query_string: str) -> None:
-        query_string = query_string.strip('?')
-        self._params = {
-            k: v if len(v) > 1 else v[0]
-            for k, v in parse_qs(query_string, keep_blank_values=True).items()
-        }
+        """
+        Splits a query string in one pass, keeping blank values.
+
+        Unlike urllib.parse.parse_qs, pairs are scanned directly,
+        percent-decoding runs only when the pair actually needs it
+        and repeated names are promoted to a list on second occurrence.
+        """
+        params: t.Dict[str, t.Any] = {}
+
+        for pair in query_string.strip('?').split('&'):
+            if not pair:
+                continue
+
+            name, _, value = pair.partition('=')
+
+            if '%' in name or '+' in name:
+                name = unquote_plus(name)
+
+            if '%' in value or '+' in value:
+                value = unquote_plus(value)
+
+            if name in params:
+                existing = params[name]
+                if isinstance(existing, list):
+                    existing.append(value)
+                else:
+                    params[name] = [existing, value]
+            else:
+                params[name] = value
+
+        self._params = params
 
     def __iter__(self):
         return iter(self._params.items())
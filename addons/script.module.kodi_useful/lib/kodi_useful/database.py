@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass, fields
 import datetime
 from functools import lru_cache, partial
+import json
 import logging
 import sqlite3
 import re
@@ -39,6 +40,23 @@ logger = logging.getLogger(__name__)
 # sqlite3.register_adapter(datetime.datetime, adapt_datetime_epoch)
 
 
+try:
+    import orjson
+
+    def json_dumps(value: t.Any) -> str:
+        return orjson.dumps(value).decode()
+
+    json_loads = orjson.loads
+except ImportError:
+    json_dumps = json.dumps
+    json_loads = json.loads
+
+
+sqlite3.register_adapter(dict, json_dumps)
+sqlite3.register_adapter(list, json_dumps)
+sqlite3.register_converter('json', json_loads)
+
+
 def convert_date(value: bytes) -> datetime.date:
     """Convert ISO 8601 date to datetime.date object."""
     return datetime.date.fromisoformat(value.decode())
@@ -49,9 +67,12 @@ def convert_datetime(value: bytes) -> datetime.datetime:
     return datetime.datetime.fromisoformat(value.decode())
 
 
-def convert_timestamp(value: bytes) -> datetime.datetime:
+def convert_timestamp(
+    value: bytes,
+    _fromtimestamp: t.Callable[[int], datetime.datetime] = datetime.datetime.fromtimestamp,
+) -> datetime.datetime:
     """Convert Unix epoch timestamp to datetime.datetime object."""
-    return datetime.datetime.fromtimestamp(int(value))
+    return _fromtimestamp(int(value))
 
 
 sqlite3.register_converter('date', convert_date)
@@ -239,6 +260,24 @@ class SQLQueryBuilder:
         set_clause = ', '.join('{0} = :{0}'.format(name) for name in columns)
         return SQLStatement(f'UPDATE {table_name} SET {set_clause} WHERE {self._where_pk()}')
 
+    def upsert(self) -> SQLStatement:
+        table_name = self._model_class.get_table_name()
+        primary_key = self._model_class.get_primary_key()
+        columns = self._model_class.get_table_columns()
+        columns_clause = ', '.join(columns)
+        placeholders = ', '.join(':{}'.format(name) for name in columns)
+        conflict_clause = ', '.join(primary_key)
+        set_clause = ', '.join(
+            '{0} = excluded.{0}'.format(name)
+            for name in columns
+            if name not in primary_key
+        )
+        action = f'DO UPDATE SET {set_clause}' if set_clause else 'DO NOTHING'
+        return SQLStatement(
+            f'INSERT INTO {table_name} ({columns_clause}) VALUES ({placeholders}) '
+            f'ON CONFLICT ({conflict_clause}) {action}'
+        )
+
 
 @dataclass
 class Model:
@@ -254,12 +293,16 @@ class Model:
 
     @classmethod
     def find(cls, id_: PrimaryKey) -> t.Optional[Model]:
+        primary_key = cls.get_primary_key()
+
         if isinstance(id_, dict):
             params = id_
+        elif len(primary_key) == 1 and not isinstance(id_, (tuple, list)):
+            params = {primary_key[0]: id_}
         else:
             if not isinstance(id_, (tuple, list)):
                 id_ = (id_,)
-            params = {name: value for name, value in zip(cls.get_primary_key(), id_)}
+            params = {name: value for name, value in zip(primary_key, id_)}
 
         row: t.Optional[Model] = cls.get_connection().query(
             cls.get_builder().select_by_pk(), model_class=cls, **params
@@ -302,6 +345,7 @@ class Model:
         return cls._table_name_
 
     @classmethod
+    @lru_cache
     def is_autoincrement_pk(cls) -> bool:
         pk = cls.get_primary_key()
 
@@ -312,10 +356,23 @@ class Model:
 
         return False
 
-    def save(self) -> None:
+    def save(self, update_first: bool = False) -> None:
+        """
+        Saves the model to the database.
+
+        Arguments:
+            update_first (bool):
+                use the legacy UPDATE-then-INSERT sequence instead of a single upsert,
+                for schemas with triggers that distinguish UPDATE from INSERT.
+        """
         is_empty_id = self.get_id() is None
 
         if not is_empty_id:
+            if not update_first:
+                with self.get_connection() as connection:
+                    connection.execute(self.get_builder().upsert(), **self.as_dict())
+                return None
+
             with self.get_connection() as connection:
                 cursor = connection.execute(self.get_builder().update(), **self.as_dict())
 
@@ -334,12 +391,16 @@ class Model:
                 self.set_id(cursor.lastrowid)
 
     def set_id(self, id_: PrimaryKey) -> None:
+        primary_key = self.get_primary_key()
+
         if isinstance(id_, dict):
-            for name in self.get_primary_key():
+            for name in primary_key:
                 setattr(self, name, id_[name])
+        elif len(primary_key) == 1 and not isinstance(id_, (tuple, list)):
+            setattr(self, primary_key[0], id_)
         else:
             if not isinstance(id_, (tuple, list)):
                 id_ = (id_,)
 
-            for name, value in zip(self.get_primary_key(), id_):
+            for name, value in zip(primary_key, id_):
                 setattr(self, name, value)
@@ -45,14 +45,17 @@ def prompt(
         required = False
 
     keyboard = xbmc.Keyboard('' if default is None else str(default), msg, hidden)
+    do_modal = keyboard.doModal
+    is_confirmed = keyboard.isConfirmed
+    get_text = keyboard.getText
 
     while 1:
-        keyboard.doModal()
+        do_modal()
 
-        if not keyboard.isConfirmed():
+        if not is_confirmed():
             return PromptResult(default, True)
 
-        value = keyboard.getText().strip()
+        value = get_text().strip()
 
         if not value:
             if not required:
@@ -22,29 +22,37 @@ def get_settings(addon_id: t.Optional[str] = None) -> xbmcaddon.Settings:
     return get_addon(addon_id).getSettings()
 
 
+_LEVELS_MAP = {
+    logging.CRITICAL: xbmc.LOGFATAL,
+    logging.ERROR: xbmc.LOGERROR,
+    logging.WARNING: xbmc.LOGWARNING,
+    logging.INFO: xbmc.LOGINFO,
+    logging.DEBUG: xbmc.LOGDEBUG,
+    logging.NOTSET: xbmc.LOGNONE,
+}
+
+
 class KodiLogHandler(logging.Handler):
-    levels_map = {
-        logging.CRITICAL: xbmc.LOGFATAL,
-        logging.ERROR: xbmc.LOGERROR,
-        logging.WARNING: xbmc.LOGWARNING,
-        logging.INFO: xbmc.LOGINFO,
-        logging.DEBUG: xbmc.LOGDEBUG,
-        logging.NOTSET: xbmc.LOGNONE,
-    }
+    levels_map = _LEVELS_MAP
 
     def emit(self, record: logging.LogRecord) -> None:
-        xbmc.log(self.format(record), self.levels_map[record.levelno])
+        xbmc.log(self.format(record), _LEVELS_MAP[record.levelno])
 
 
 def init_logger(
     name: str | None = None,
     level: int = logging.DEBUG,
 ) -> None:
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+
+    if any(isinstance(h, KodiLogHandler) for h in logger.handlers):
+        return
+
     addon_id = get_addon().getAddonInfo('id')
 
     handler = KodiLogHandler(level)
     handler.setFormatter(logging.Formatter(f'%(levelname)s [{addon_id}][%(name)s] %(message)s'))
 
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
     logger.addHandler(handler)
+    logger.propagate = False
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import os
 import sys
-from functools import cached_property, partial
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from http import server, HTTPStatus
 import mimetypes
 import json
@@ -11,7 +13,7 @@ import socket
 from string import Template
 import threading
 import typing as t
-from urllib.parse import urlsplit
+from urllib.parse import urlsplit, SplitResult
 
 from .core import QueryParams
 
@@ -21,13 +23,22 @@ try:
 except ImportError:
     pass
 
-if t.TYPE_CHECKING:
-    from urllib.parse import SplitResult
-
 
 PathLike = t.Union[str, pathlib.Path]
 
 
+try:
+    import orjson
+
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(value: t.Any) -> bytes:
+        return json.dumps(value).encode('utf-8')
+
+    json_loads = json.loads
+
+
 __all__ = (
     'HTTPRequestHandler',
     'HTTPError',
@@ -36,6 +47,53 @@ __all__ = (
 )
 
 
+def compile_template(source: str) -> t.Callable[[t.Mapping[str, t.Any]], str]:
+    """
+    Pre-tokenizes a string.Template source into literal/placeholder parts,
+    so rendering is a join instead of a regex pass per request.
+    """
+    parts: t.List[t.Tuple[str, t.Optional[str]]] = []
+    last = 0
+
+    for mo in Template.pattern.finditer(source):
+        start, end = mo.span()
+
+        if start > last:
+            parts.append((source[last:start], None))
+
+        name = mo.group('named') or mo.group('braced')
+
+        if name is not None:
+            parts.append(('', name))
+        elif mo.group('escaped') is not None:
+            parts.append(('$', None))
+        else:
+            raise ValueError('Invalid placeholder in string: %r' % mo.group())
+
+        last = end
+
+    if last < len(source):
+        parts.append((source[last:], None))
+
+    def render(kwargs: t.Mapping[str, t.Any]) -> str:
+        return ''.join(
+            literal if name is None else str(kwargs[name])
+            for literal, name in parts
+        )
+
+    return render
+
+
+@lru_cache(maxsize=32)
+def load_template(path: PathLike, mtime_ns: int) -> t.Callable[[t.Mapping[str, t.Any]], str]:
+    """Reads and tokenizes the template once per modification and caches the result."""
+    return compile_template(pathlib.Path(path).read_text())
+
+
+mimetypes.init()
+
+
+@lru_cache(maxsize=128)
 def guess_type(path: PathLike) -> str:
     """Guesses and returns the mimetype for the given path or URL."""
     ctype, _ = mimetypes.guess_type(path)
@@ -65,73 +123,105 @@ class HTTPError(Exception):
         self.status = status
 
 
+_UNSET: t.Any = object()
+
+
 class HTTPRequestHandler(server.BaseHTTPRequestHandler):
     def __init__(
         self,
         *args: t.Any,
-        url_handlers: t.Dict[str, t.Dict[str, t.Callable]],
+        routes: t.Dict[t.Tuple[str, str], t.Callable],
+        known_paths: t.Set[str],
         root_dir: PathLike,
+        static_prefixes: t.FrozenSet[str] = frozenset(('/static',)),
         **kwargs: t.Any,
     ) -> None:
-        self.url_handlers = url_handlers
+        self.routes = routes
+        self.known_paths = known_paths
         self.root_dir = pathlib.Path(root_dir)
+        self.static_prefixes = static_prefixes
+        self._form = self._json = self._post_data = self._query = self._url = _UNSET
         super().__init__(*args, **kwargs)
 
-    @cached_property
+    @property
     def form(self) -> QueryParams:
-        ctype = self.headers.get('Content-Type', '')
+        if self._form is _UNSET:
+            ctype = self.headers.get('Content-Type', '')
+
+            if ctype.startswith('multipart/form-data'):
+                raise HTTPError(HTTPStatus.NOT_IMPLEMENTED)
 
-        if ctype.startswith('multipart/form-data'):
-            raise HTTPError(HTTPStatus.NOT_IMPLEMENTED)
+            self._form = QueryParams(self.post_data.decode('utf-8'))
 
-        return QueryParams(self.post_data.decode('utf-8'))
+        return self._form
 
-    @cached_property
+    @property
     def json(self) -> t.Any:
         """Returns the request body parsed from JSON format, otherwise an error."""
-        try:
-            return json.loads(self.post_data.decode('utf-8'))
-        except json.JSONDecodeError:
-            raise HTTPError(HTTPStatus.BAD_REQUEST)
+        if self._json is _UNSET:
+            try:
+                self._json = json_loads(self.post_data)
+            except json.JSONDecodeError:
+                raise HTTPError(HTTPStatus.BAD_REQUEST)
 
-    @cached_property
+        return self._json
+
+    @property
     def post_data(self) -> bytes:
-        content_length = int(self.headers.get('Content-Length', 0))
-        return self.rfile.read(content_length)
+        if self._post_data is _UNSET:
+            content_length = int(self.headers.get('Content-Length', 0))
+            self._post_data = self.rfile.read(content_length)
+
+        return self._post_data
 
-    @cached_property
+    @property
     def query(self) -> QueryParams:
         """Returns the URL query string parameters."""
-        return QueryParams(self.url.query)
+        if self._query is _UNSET:
+            self._query = QueryParams(self.url.query)
+
+        return self._query
 
-    @cached_property
+    @property
     def url(self) -> SplitResult:
         """
         Returns the parsed URL of the request from 5 components:
         <scheme>://<netloc>/<path>?<query>#<fragment>
         """
-        return urlsplit(self.path)
+        if self._url is _UNSET:
+            path = self.path
+
+            if '?' not in path and '#' not in path:
+                self._url = SplitResult('', '', path, '', '')
+            else:
+                self._url = urlsplit(path)
+
+        return self._url
 
     def process_request(self) -> None:
         method = self.command.lower()
-        # self.request
+        path = self.url.path
+
+        end = path.find('/', 1)
+        first_segment = path if end < 0 else path[:end]
 
-        if self.url.path.startswith('/static'):
+        if first_segment in self.static_prefixes:
             if method not in ('get', 'head'):
                 return self.send_error(HTTPStatus.METHOD_NOT_ALLOWED)
             return self.send_static()
 
-        path = self.url.path.rstrip('/') or '/'
+        handler = self.routes.get((path, method))
 
-        if path not in self.url_handlers:
-            return self.send_error(HTTPStatus.NOT_FOUND)
+        if handler is None:
+            # Registration stores both slash variants, so this only runs
+            # for unknown paths, unknown methods and repeated trailing slashes.
+            path = path.rstrip('/') or '/'
+            handler = self.routes.get((path, method))
 
-        handlers = self.url_handlers[path]
-
-        if method not in handlers:
-            return self.send_error(HTTPStatus.METHOD_NOT_ALLOWED)
-
-        handler = handlers[method]
+            if handler is None:
+                if path in self.known_paths:
+                    return self.send_error(HTTPStatus.METHOD_NOT_ALLOWED)
+                return self.send_error(HTTPStatus.NOT_FOUND)
 
         try:
             resp = handler(self)
@@ -147,14 +237,25 @@ class HTTPRequestHandler(server.BaseHTTPRequestHandler):
 
             r = Response(*resp)
 
+            body = r.get_body()
+
             self.send_response(r.status)
 
-            for name, value in r.get_headers().items():
+            headers = r.get_headers()
+
+            for name, value in headers.items():
                 self.send_header(name, value)
 
-            self.end_headers()
+            if not any(name.lower() == 'content-length' for name in headers):
+                self.send_header('Content-Length', str(len(body)))
 
-            self.wfile.write(r.get_body())
+            if self.request_version != 'HTTP/0.9':
+                # Send the buffered status line, headers and body with a single write.
+                self._headers_buffer.append(b'\r\n')
+                self._headers_buffer.append(body)
+                self.flush_headers()
+            else:
+                self.wfile.write(body)
         except HTTPError as err:
             self.send_error(err.status)
         except Exception as err:
@@ -168,20 +269,22 @@ class HTTPRequestHandler(server.BaseHTTPRequestHandler):
 
     def send_json(self, data, status=HTTPStatus.OK):
         try:
-            json_string = json.dumps(data)
+            body = json_dumps(data)
         except TypeError:
             return self.send_error(HTTPStatus.BAD_REQUEST)
 
-        return status, json_string, {
+        return status, body, {
             'Content-Type': 'application/json',
-            'Content-Length': str(len(json_string)),
+            'Content-Length': str(len(body)),
         }
 
     def send_static(self) -> None:
         path = self.root_dir / self.url.path.lstrip('/')
 
         try:
-            f = path.open('rb')
+            # Unbuffered: the file is either handed to sendfile by fd
+            # or streamed in large chunks, so the extra buffer layer only copies.
+            f = path.open('rb', buffering=0)
         except OSError:
             self.send_error(HTTPStatus.NOT_FOUND)
             return None
@@ -191,11 +294,23 @@ class HTTPRequestHandler(server.BaseHTTPRequestHandler):
         self.send_response(HTTPStatus.OK)
         self.send_header('Content-type', guess_type(path))
         self.send_header('Content-Length', str(fs.st_size))
-        self.end_headers()
 
         try:
-            if self.command != 'HEAD':
-                shutil.copyfileobj(f, self.wfile)
+            if self.command == 'HEAD':
+                self.end_headers()
+            elif fs.st_size <= 64 * 1024 and self.request_version != 'HTTP/0.9':
+                # Small assets leave in a single write together with the headers.
+                self._headers_buffer.append(b'\r\n')
+                self._headers_buffer.append(f.read())
+                self.flush_headers()
+            else:
+                self.end_headers()
+
+                try:
+                    self.wfile.flush()
+                    self.connection.sendfile(f)
+                except (AttributeError, OSError):
+                    shutil.copyfileobj(f, self.wfile, length=1024 * 1024)
         finally:
             f.close()
 
@@ -203,20 +318,39 @@ class HTTPRequestHandler(server.BaseHTTPRequestHandler):
 
     def render_template(self, name, **kwargs):
         path = self.root_dir / name
-        tmpl = Template(path.read_text())
-        content = tmpl.substitute(**kwargs)
+        content = load_template(path, path.stat().st_mtime_ns)(kwargs)
+        # Content-Length is computed from the encoded body in process_request;
+        # len(content) counts code points and is wrong for multibyte text.
         return HTTPStatus.OK, content, {
             'Content-type': guess_type(path),
-            'Content-Length': str(len(content)),
         }
 
 
+class PooledHTTPServer(server.ThreadingHTTPServer):
+    """Threading HTTP server that handles connections on a fixed thread pool."""
+
+    def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._pool = ThreadPoolExecutor(
+            max_workers=min(32, (os.cpu_count() or 1) * 4),
+            thread_name_prefix=type(self).__name__,
+        )
+
+    def process_request(self, request, client_address) -> None:
+        self._pool.submit(self.process_request_thread, request, client_address)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._pool.shutdown(wait=False)
+
+
 class HTTPServer:
     def __init__(
         self,
         host: str = 'localhost',
         port: int = 0,
         root_dir: PathLike = '',
+        static_prefixes: t.Iterable[str] = ('/static',),
     ) -> None:
         self._address = (host, port)
         self._httpd: t.Optional[server.HTTPServer] = None
@@ -228,9 +362,14 @@ class HTTPServer:
         else:
             root_dir = pathlib.Path(root_dir)
 
-        self._url_handlers = {}
+        self._routes: t.Dict[t.Tuple[str, str], t.Callable] = {}
+        self._known_paths: t.Set[str] = set()
         self._handler = partial(
-            HTTPRequestHandler, url_handlers=self._url_handlers, root_dir=root_dir
+            HTTPRequestHandler,
+            routes=self._routes,
+            known_paths=self._known_paths,
+            root_dir=root_dir,
+            static_prefixes=frozenset(static_prefixes),
         )
 
     def delete(self, path: str):
@@ -257,9 +396,18 @@ class HTTPServer:
         return self.register_handler(path, method='put')
 
     def register_handler(self, path: str, method: str):
+        path = path.rstrip('/') or '/'
+
         def decorator(handler):
-            handlers = self._url_handlers.setdefault(path, {})
-            handlers[method] = handler
+            self._routes[(path, method)] = handler
+            self._known_paths.add(path)
+
+            if path != '/':
+                # Register the trailing-slash variant too, so request paths
+                # match with a single dict lookup instead of an rstrip per request.
+                self._routes[(path + '/', method)] = handler
+                self._known_paths.add(path + '/')
+
             return handler
         return decorator
 
@@ -281,7 +429,7 @@ class HTTPServer:
             return None
 
         try:
-            self._httpd = server.ThreadingHTTPServer(self._address, self._handler)
+            self._httpd = PooledHTTPServer(self._address, self._handler)
         except socket.error as err:
             self.log(err)
             return None
@@ -306,7 +454,7 @@ class HTTPServer:
             return None
 
         self._httpd.shutdown()
-        self._httpd.socket.close()
+        self._httpd.server_close()
         self._httpd = None
 
         if self._httpd_thread is not None: